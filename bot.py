@@ -20,8 +20,9 @@ from config import (
     TELEGRAM_CHANNEL_ID,
     CHECK_INTERVAL_MINUTES,
 )
-from database import init_db, is_sent, mark_sent, cleanup_old_articles
-from fetcher import fetch_all_feeds, Article
+from database import init_db, cleanup_old_articles
+from fetcher import Article
+from pipeline import run_cycle
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -100,23 +101,10 @@ async def send_article(bot: Bot, article: Article) -> bool:
 async def check_and_send(bot: Bot) -> None:
     """Ambil semua feed, filter duplikat, dan kirim yang baru."""
     logger.info("== Mulai pengecekan berita terbaru ==")
-    articles = fetch_all_feeds()
-    logger.info("Total artikel dari semua feed: %d", len(articles))
-
-    sent_count = 0
-    skip_count = 0
-
-    for article in articles:
-        if is_sent(article.url):
-            skip_count += 1
-            continue
-
-        success = await send_article(bot, article)
-        if success:
-            mark_sent(article.url)
-            sent_count += 1
-            # Delay antar pesan agar tidak kena rate-limit Telegram
-            await asyncio.sleep(1.5)
+
+    sent_count, skip_count = await run_cycle(
+        lambda article: send_article(bot, article)
+    )
 
     logger.info(
         "== Selesai. Terkirim: %d | Dilewati (duplikat): %d ==",
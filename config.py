@@ -20,6 +20,32 @@ CHECK_INTERVAL_MINUTES = int(os.getenv("CHECK_INTERVAL_MINUTES", "15"))
 # ─── Batas maksimal artikel per feed per siklus (agar tidak spam) ───────────
 MAX_ARTICLES_PER_FEED = int(os.getenv("MAX_ARTICLES_PER_FEED", "3"))
 
+# ─── Mode Catch-up (setelah Function dimatikan / bot crash) ─────────────────
+# Jika jarak sejak siklus tuntas terakhir suatu feed melebihi ini, feed tsb
+# masuk mode catch-up: semua artikel sejak titik itu diambil, bukan hanya top-N
+CATCHUP_GAP_MINUTES = int(os.getenv("CATCHUP_GAP_MINUTES", "40"))
+# Batas mundur maksimal saat catch-up (jam)
+CATCHUP_MAX_HOURS = int(os.getenv("CATCHUP_MAX_HOURS", "24"))
+# Maks halaman arsip yang diikuti per feed (via <link rel="next">)
+CATCHUP_MAX_PAGES = int(os.getenv("CATCHUP_MAX_PAGES", "5"))
+# Maks artikel dikirim per siklus catch-up (terbaru lebih dulu; sisanya
+# dilanjutkan di siklus berikutnya)
+CATCHUP_QUEUE_SIZE = int(os.getenv("CATCHUP_QUEUE_SIZE", "100"))
+# Anggaran waktu satu siklus catch-up (detik) — di bawah functionTimeout 5 menit
+CATCHUP_TIME_BUDGET_SECONDS = int(os.getenv("CATCHUP_TIME_BUDGET_SECONDS", "240"))
+
+# ─── Transport HTTP untuk fetch RSS ───────────────────────────────────────────
+# Timeout per request (detik)
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", "15"))
+# Lama cache DNS in-process untuk host feed (detik); 0 = nonaktif.
+# Catatan: diaktifkan dengan mengganti socket.getaddrinfo secara global untuk
+# seluruh proses; host di luar RSS_FEEDS tetap di-resolve tanpa cache.
+DNS_CACHE_TTL_SECONDS = int(os.getenv("DNS_CACHE_TTL_SECONDS", "300"))
+# Hedged request: kirim request kedua jika yang pertama melewati p95 feed tsb
+HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "false").lower() in ("1", "true", "yes")
+# Jumlah sampel latensi minimal sebelum p95 dipakai sebagai ambang hedge
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "5"))
+
 # ─── Azure Storage (menggantikan SQLite) ─────────────────────────────────────
 # Connection string dari portal Azure → Storage Account → Access keys
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING", "")
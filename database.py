@@ -7,6 +7,7 @@ Menggantikan SQLite karena Azure Functions filesystem bersifat ephemeral.
 import hashlib
 import logging
 from datetime import datetime, timezone, timedelta
+from typing import Dict, List
 from azure.data.tables import TableServiceClient, TableClient
 from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
 from config import AZURE_STORAGE_CONNECTION_STRING, TABLE_NAME
@@ -102,3 +103,35 @@ def cleanup_old_articles(days: int = 30) -> None:
             logger.info("Cleanup: %d artikel lama dihapus dari Table Storage.", deleted)
     except Exception as e:
         logger.warning("Cleanup gagal (non-fatal): %s", e)
+
+
+
+def get_feed_watermarks() -> Dict[str, datetime]:
+    """
+    Waktu siklus sukses terakhir per feed (key: URL feed).
+    Dict kosong / feed tanpa entri berarti belum pernah jalan. Error storage
+    sengaja dilempar agar pemanggil tidak menganggapnya run pertama.
+    """
+    client = _get_table_client()
+    entities = client.query_entities(query_filter="PartitionKey eq 'watermark'")
+    return {e["url"]: datetime.fromisoformat(e["at"]) for e in entities}
+
+
+def mark_feeds_success(feed_urls: List[str], at: datetime) -> None:
+    """Majukan watermark feed yang tuntas di siklus ini (satu batch transaksi)."""
+    if not feed_urls:
+        return
+    client = _get_table_client()
+    operations = [
+        ("upsert", {
+            "PartitionKey": "watermark",
+            "RowKey":        _url_to_row_key(url),
+            "url":           url,
+            "at":            at.isoformat(),
+        })
+        for url in feed_urls
+    ]
+    try:
+        client.submit_transaction(operations)
+    except Exception as e:
+        logger.error("Gagal menyimpan watermark feed: %s", e)
@@ -4,12 +4,28 @@ Mengambil dan mem-parsing artikel dari semua feed yang dikonfigurasi
 """
 
 import logging
+import socket
+import time
 import feedparser
 import requests
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Optional
-from config import RSS_FEEDS, MAX_ARTICLES_PER_FEED
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from config import (
+    RSS_FEEDS,
+    MAX_ARTICLES_PER_FEED,
+    CATCHUP_GAP_MINUTES,
+    CATCHUP_MAX_HOURS,
+    CATCHUP_MAX_PAGES,
+    FETCH_TIMEOUT_SECONDS,
+    DNS_CACHE_TTL_SECONDS,
+    HEDGE_REQUESTS,
+    HEDGE_MIN_SAMPLES,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +33,132 @@ HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (compatible; NasionalNewsBot/1.0; "
         "+https://github.com/nationalbot)"
-    )
+    ),
+    "Accept-Encoding": "gzip, deflate",
 }
 
+# Host unik dari semua feed (Antara & CNBC berbagi host yang sama)
+FEED_HOSTS = {urlparse(url).hostname for url in RSS_FEEDS.values()}
+# URL feed utama; hanya ini yang dicatat latensinya dan boleh di-hedge
+FEED_URLS = set(RSS_FEEDS.values())
+
+# Jumlah sampel latensi terakhir yang disimpan per feed untuk hitung p95
+LATENCY_WINDOW = 50
+
+
+# ─── Transport: Session + Pool per Host ──────────────────────────────────────
+_session: Optional[requests.Session] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_latencies: Dict[str, Deque[float]] = defaultdict(
+    lambda: deque(maxlen=LATENCY_WINDOW)
+)
+
+
+def _get_session() -> requests.Session:
+    """
+    Session bersama dengan pool keep-alive per host, agar feed dari host yang
+    sama tidak membayar DNS + TCP + TLS lagi di setiap request.
+    """
+    global _session
+    if _session is None:
+        _install_dns_cache()
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        # pool_connections = jumlah host yang pool-nya disimpan,
+        # pool_maxsize = koneksi per host (2 agar request hedge tidak antre)
+        adapter = HTTPAdapter(pool_connections=len(FEED_HOSTS), pool_maxsize=2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fetch")
+    return _executor
+
+
+# ─── DNS Cache In-Process ─────────────────────────────────────────────────────
+_dns_cache: Dict[tuple, Tuple[float, list]] = {}
+_original_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(host, *args, **kwargs):
+    """getaddrinfo dengan cache TTL, hanya untuk host yang ada di RSS_FEEDS."""
+    if host not in FEED_HOSTS:
+        return _original_getaddrinfo(host, *args, **kwargs)
+    key = (host, args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    cached = _dns_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    result = _original_getaddrinfo(host, *args, **kwargs)
+    _dns_cache[key] = (now + DNS_CACHE_TTL_SECONDS, result)
+    return result
+
+
+def _install_dns_cache() -> None:
+    # Catatan: ini mengganti socket.getaddrinfo untuk SELURUH proses (urllib3
+    # memanggilnya langsung) dan tidak pernah dikembalikan. Dampaknya dibatasi
+    # karena _cached_getaddrinfo meneruskan host di luar FEED_HOSTS apa adanya.
+    if DNS_CACHE_TTL_SECONDS > 0 and socket.getaddrinfo is _original_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+# ─── Download + Hedged Request ────────────────────────────────────────────────
+def _p95(feed_url: str) -> Optional[float]:
+    """p95 latensi feed dari sampel terakhir; None jika sampel belum cukup."""
+    samples = _latencies.get(feed_url)
+    if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def _download(feed_url: str) -> bytes:
+    """Unduh body feed secara streaming; gzip/deflate di-decode per chunk."""
+    start = time.monotonic()
+    try:
+        with _get_session().get(
+            feed_url, timeout=FETCH_TIMEOUT_SECONDS, stream=True
+        ) as resp:
+            resp.raise_for_status()
+            return b"".join(resp.iter_content(chunk_size=16 * 1024))
+    finally:
+        # Request yang gagal/timeout ikut dicatat agar p95 tidak bias ke bawah
+        if feed_url in FEED_URLS:
+            _latencies[feed_url].append(time.monotonic() - start)
+
+
+def _fetch_body(source_name: str, feed_url: str) -> bytes:
+    """
+    Ambil body feed. Jika hedging aktif dan request pertama melewati p95
+    feed tersebut, kirim request kedua dan pakai yang selesai lebih dulu.
+    """
+    threshold = _p95(feed_url) if HEDGE_REQUESTS and feed_url in FEED_URLS else None
+    if threshold is None:
+        return _download(feed_url)
+
+    executor = _get_executor()
+    futures = [executor.submit(_download, feed_url)]
+    done, _ = wait(futures, timeout=threshold)
+    if not done:
+        logger.info(
+            "Hedge [%s]: request pertama > p95 (%.2fs), kirim request kedua.",
+            source_name, threshold,
+        )
+        futures.append(executor.submit(_download, feed_url))
+
+    error: Optional[Exception] = None
+    for future in as_completed(futures):
+        try:
+            return future.result()
+        except requests.RequestException as e:
+            error = e
+    raise error
+
 
 @dataclass
 class Article:
@@ -29,6 +168,7 @@ class Article:
     summary: str = ""
     published: str = ""
     image_url: Optional[str] = field(default=None)
+    published_at: Optional[datetime] = field(default=None)  # UTC, untuk urutan
 
 
 def _get_image(entry) -> Optional[str]:
@@ -65,64 +205,205 @@ def _clean_summary(raw: str, max_len: int = 700) -> str:
     return text
 
 
-def fetch_feed(source_name: str, feed_url: str) -> List[Article]:
-    """Ambil artikel terbaru dari satu RSS feed."""
-    articles: List[Article] = []
+def _entry_time(entry) -> Optional[datetime]:
+    """Waktu terbit entry dalam UTC (feedparser menormalkan ke UTC)."""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if not parsed:
+        return None
     try:
-        resp = requests.get(feed_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
-        feed = feedparser.parse(resp.content)
+        return datetime(*parsed[:6], tzinfo=timezone.utc)
+    except Exception:
+        return None
 
-        entries = feed.entries[:MAX_ARTICLES_PER_FEED]
-        for entry in entries:
-            url = entry.get("link", "")
-            if not url:
-                continue
 
-            title = entry.get("title", "Tanpa Judul").strip()
+def _entry_to_article(source_name: str, entry) -> Optional[Article]:
+    """Ubah satu entry feedparser menjadi Article; None jika tanpa link."""
+    url = entry.get("link", "")
+    if not url:
+        return None
+
+    title = entry.get("title", "Tanpa Judul").strip()
 
-            # Ambil teks terpanjang yang tersedia: content > summary > description
-            raw_text = ""
-            if hasattr(entry, "content") and entry.content:
-                raw_text = entry.content[0].get("value", "")
-            if not raw_text:
-                raw_text = entry.get("summary", "") or entry.get("description", "")
+    # Ambil teks terpanjang yang tersedia: content > summary > description
+    raw_text = ""
+    if hasattr(entry, "content") and entry.content:
+        raw_text = entry.content[0].get("value", "")
+    if not raw_text:
+        raw_text = entry.get("summary", "") or entry.get("description", "")
 
-            summary = _clean_summary(raw_text)
-            image = _get_image(entry)
+    summary = _clean_summary(raw_text)
+    image = _get_image(entry)
 
-            # Format tanggal
+    # Format tanggal
+    published = ""
+    if hasattr(entry, "published_parsed") and entry.published_parsed:
+        try:
+            dt = datetime(*entry.published_parsed[:6])
+            published = dt.strftime("%d %b %Y, %H:%M WIB")
+        except Exception:
             published = ""
-            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                try:
-                    dt = datetime(*entry.published_parsed[:6])
-                    published = dt.strftime("%d %b %Y, %H:%M WIB")
-                except Exception:
-                    published = ""
-
-            articles.append(Article(
-                source=source_name,
-                title=title,
-                url=url,
-                summary=summary,
-                published=published,
-                image_url=image,
-            ))
-
-    except requests.RequestException as e:
-        logger.warning("Gagal mengambil feed [%s]: %s", source_name, e)
-    except Exception as e:
-        logger.error("Error parsing feed [%s]: %s", source_name, e)
-
-    return articles
-
-
-def fetch_all_feeds() -> List[Article]:
-    """Ambil artikel dari SEMUA feed yang terdaftar di config."""
+
+    return Article(
+        source=source_name,
+        title=title,
+        url=url,
+        summary=summary,
+        published=published,
+        image_url=image,
+        published_at=_entry_time(entry),
+    )
+
+
+def _next_page_url(feed, page_url: str) -> Optional[str]:
+    """URL halaman arsip berikutnya (RFC 5005 / <link rel="next">), jika ada."""
+    for link in feed.feed.get("links", []):
+        if link.get("rel") == "next" and link.get("href"):
+            # href bisa relatif (mis. "/page2"); resolve terhadap halaman ini
+            return urljoin(page_url, link["href"])
+    return None
+
+
+def _entries_since(
+    source_name: str,
+    feed,
+    feed_url: str,
+    since: datetime,
+    deadline: Optional[float] = None,
+) -> Tuple[list, bool]:
+    """
+    Kumpulkan semua entry yang terbit setelah `since`, mengikuti halaman
+    arsip selama halaman terakhir masih seluruhnya lebih baru dari `since`.
+    Entry tanpa tanggal hanya diambil dari top-N halaman pertama.
+
+    Kembalikan (entries, complete). `complete` False jika paginasi berhenti
+    sebelum mencapai `since` karena error atau `deadline` hampir habis;
+    entry yang sudah terkumpul tetap dikembalikan.
+    """
+    entries = [
+        e for e in feed.entries[:MAX_ARTICLES_PER_FEED] if _entry_time(e) is None
+    ]
+    page_url = feed_url
+    pages = 1
+    while True:
+        dated = [(e, _entry_time(e)) for e in feed.entries]
+        entries.extend(e for e, t in dated if t is not None and t > since)
+        if any(t is not None and t <= since for _, t in dated):
+            return entries, True
+
+        next_url = _next_page_url(feed, page_url)
+        if not next_url:
+            return entries, True
+        if pages >= CATCHUP_MAX_PAGES:
+            return entries, False
+        # Satu halaman bisa makan FETCH_TIMEOUT_SECONDS; jangan lewati deadline
+        if deadline and deadline - time.monotonic() < FETCH_TIMEOUT_SECONDS:
+            logger.warning("[%s] catch-up: paginasi dihentikan (deadline).", source_name)
+            return entries, False
+
+        logger.debug("[%s] catch-up: ambil halaman arsip %s", source_name, next_url)
+        try:
+            feed = feedparser.parse(_fetch_body(source_name, next_url))
+        except requests.RequestException as e:
+            logger.warning(
+                "[%s] catch-up: gagal ambil halaman arsip %s: %s",
+                source_name, next_url, e,
+            )
+            return entries, False
+        page_url = next_url
+        pages += 1
+
+
+def _fetch_feed(
+    source_name: str,
+    feed_url: str,
+    since: Optional[datetime],
+    deadline: Optional[float],
+) -> Tuple[List[Article], bool]:
+    """Ambil satu feed; melempar exception dan melaporkan kelengkapan paginasi."""
+    feed = feedparser.parse(_fetch_body(source_name, feed_url))
+
+    complete = True
+    if since is None:
+        entries = feed.entries[:MAX_ARTICLES_PER_FEED]
+    else:
+        entries, complete = _entries_since(
+            source_name, feed, feed_url, since, deadline
+        )
+
+    articles: List[Article] = []
+    for entry in entries:
+        article = _entry_to_article(source_name, entry)
+        if article:
+            articles.append(article)
+    return articles, complete
+
+
+def fetch_all_feeds(
+    since: Optional[Dict[str, datetime]] = None, deadline: Optional[float] = None
+) -> Tuple[List[Article], List[str]]:
+    """
+    Ambil artikel dari SEMUA feed yang terdaftar di config.
+
+    `since` memetakan nama feed ke titik awal catch-up; feed lain diambil
+    normal (top-N). Feed catch-up diambil lebih dulu, yang paling tertinggal
+    duluan, agar feed yang sama tidak selalu kehabisan `deadline`.
+
+    Kembalikan (artikel, feed_tidak_lengkap): nama feed yang gagal diambil,
+    paginasinya terpotong, atau dilewati karena `deadline` (time.monotonic)
+    sudah lewat.
+    """
+    since = since or {}
+    order = sorted(
+        RSS_FEEDS,
+        key=lambda name: (0, since[name]) if name in since else (1,),
+    )
+
     all_articles: List[Article] = []
-    for name, url in RSS_FEEDS.items():
+    incomplete: List[str] = []
+    for name in order:
+        if deadline and time.monotonic() >= deadline:
+            logger.warning("[%s] dilewati: deadline fetch sudah lewat.", name)
+            incomplete.append(name)
+            continue
         logger.debug("Mengambil feed: %s", name)
-        articles = fetch_feed(name, url)
+        try:
+            articles, complete = _fetch_feed(
+                name, RSS_FEEDS[name], since.get(name), deadline
+            )
+        except requests.RequestException as e:
+            logger.warning("Gagal mengambil feed [%s]: %s", name, e)
+            incomplete.append(name)
+            continue
+        except Exception as e:
+            logger.error("Error parsing feed [%s]: %s", name, e)
+            incomplete.append(name)
+            continue
+        if not complete:
+            incomplete.append(name)
         all_articles.extend(articles)
         logger.info("[%s] → %d artikel ditemukan.", name, len(articles))
-    return all_articles
+    return all_articles, incomplete
+
+
+# ─── Catch-up ─────────────────────────────────────────────────────────────────
+def catchup_since(
+    last_success: Optional[datetime], now: datetime
+) -> Optional[datetime]:
+    """
+    Kembalikan titik awal catch-up jika gap sejak siklus sukses terakhir
+    melebihi CATCHUP_GAP_MINUTES (dibatasi CATCHUP_MAX_HOURS ke belakang);
+    None berarti siklus normal.
+    """
+    if last_success is None:
+        return None
+    if now - last_success <= timedelta(minutes=CATCHUP_GAP_MINUTES):
+        return None
+    return max(last_success, now - timedelta(hours=CATCHUP_MAX_HOURS))
+
+
+def prioritize_articles(articles: List[Article]) -> List[Article]:
+    """Urutkan artikel terbaru lebih dulu; artikel tanpa tanggal paling akhir."""
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(
+        articles, key=lambda a: a.published_at or oldest, reverse=True
+    )
@@ -6,7 +6,6 @@ Dipanggil otomatis oleh Azure setiap 15 menit via CRON expression.
 Tidak butuh server yang terus hidup (scale to zero).
 """
 
-import asyncio
 import logging
 import azure.functions as func
 from datetime import date as date_type
@@ -19,8 +18,9 @@ from config import (
     TELEGRAM_CHANNEL_ID,
     MAX_ARTICLES_PER_FEED,
 )
-from database import init_table, is_sent, mark_sent, cleanup_old_articles
-from fetcher import fetch_all_feeds, Article
+from database import init_table, cleanup_old_articles
+from fetcher import Article
+from pipeline import run_cycle
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
 logger = logging.getLogger(__name__)
@@ -113,24 +113,9 @@ async def run_news_job() -> None:
         logger.critical("Gagal konek ke Telegram: %s", e)
         return
 
-    # Ambil semua artikel dari 17 feed
-    articles = fetch_all_feeds()
-    logger.info("Total artikel dari semua feed: %d", len(articles))
-
-    sent_count = 0
-    skip_count = 0
-
-    for article in articles:
-        if is_sent(article.url):
-            skip_count += 1
-            continue
-
-        success = await send_article(bot, article)
-        if success:
-            mark_sent(article.url)
-            sent_count += 1
-            # Delay antar pesan agar tidak kena rate-limit Telegram (30 msg/detik)
-            await asyncio.sleep(1.5)
+    sent_count, skip_count = await run_cycle(
+        lambda article: send_article(bot, article)
+    )
 
     logger.info(
         "Selesai. Terkirim: %d | Dilewati (duplikat): %d",
@@ -0,0 +1,123 @@
+"""
+Siklus Pengiriman Berita
+Logika bersama untuk function_app.py (Azure) dan bot.py (lokal):
+ambil feed, deteksi gap per feed (mode catch-up), filter duplikat, kirim ke Telegram.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Tuple
+
+from config import RSS_FEEDS, CATCHUP_QUEUE_SIZE, CATCHUP_TIME_BUDGET_SECONDS
+from database import is_sent, mark_sent, get_feed_watermarks, mark_feeds_success
+from fetcher import fetch_all_feeds, catchup_since, prioritize_articles, Article
+
+logger = logging.getLogger(__name__)
+
+
+async def run_cycle(
+    send: Callable[[Article], Awaitable[bool]],
+) -> Tuple[int, int]:
+    """
+    Jalankan satu siklus pengecekan; kembalikan (terkirim, dilewati).
+
+    Setiap feed punya watermark (waktu siklus terakhir yang tuntas untuk feed
+    itu). Feed dengan gap > CATCHUP_GAP_MINUTES masuk mode catch-up: semua
+    artikel sejak watermark-nya diambil. Selama ada feed catch-up, artikel
+    dikirim terbaru lebih dulu, maksimal CATCHUP_QUEUE_SIZE, dalam
+    CATCHUP_TIME_BUDGET_SECONDS. Watermark hanya maju untuk feed yang terambil
+    lengkap dan seluruh artikelnya terkirim, sehingga sisanya dilanjutkan di
+    siklus berikutnya tanpa menahan feed lain.
+    """
+    cycle_start = datetime.now(timezone.utc)
+    try:
+        watermarks = get_feed_watermarks()
+    except Exception as e:
+        # Jangan anggap run pertama: watermark lama bisa tertimpa dan gap hilang
+        logger.error("Gagal membaca watermark feed, catch-up dilewati: %s", e)
+        watermarks = None
+
+    since = {}
+    if watermarks is not None:
+        for name, url in RSS_FEEDS.items():
+            start = catchup_since(watermarks.get(url), cycle_start)
+            if start:
+                since[name] = start
+
+    deadline = None
+    fetch_deadline = None
+    if since:
+        logger.warning(
+            "Mode catch-up untuk %d feed: %s", len(since), ", ".join(since)
+        )
+        started = time.monotonic()
+        deadline = started + CATCHUP_TIME_BUDGET_SECONDS
+        # Separuh anggaran untuk fetch, sisanya untuk cek duplikat + kirim
+        fetch_deadline = started + CATCHUP_TIME_BUDGET_SECONDS / 2
+
+    articles, incomplete = fetch_all_feeds(since=since, deadline=fetch_deadline)
+    logger.info("Total artikel dari semua feed: %d", len(articles))
+
+    queue = prioritize_articles(articles) if since else articles
+
+    sent_count = 0
+    skip_count = 0
+    attempted = 0
+    seen = set()
+    # Feed yang belum tuntas siklus ini; watermark-nya tidak dimajukan
+    unfinished = set(incomplete)
+
+    for i, article in enumerate(queue):
+        # URL yang sama bisa muncul di beberapa feed (mis. Antara Terkini & Top News)
+        if article.url in seen:
+            skip_count += 1
+            continue
+        seen.add(article.url)
+
+        if since:
+            stop_reason = None
+            if time.monotonic() >= deadline:
+                stop_reason = "anggaran waktu habis"
+            elif attempted >= CATCHUP_QUEUE_SIZE:
+                stop_reason = "antrean penuh"
+            if stop_reason:
+                unfinished.update(a.source for a in queue[i:])
+                logger.warning(
+                    "Catch-up: %s, sisa %d artikel dilanjutkan di siklus "
+                    "berikutnya.", stop_reason, len(queue) - i,
+                )
+                break
+
+        if is_sent(article.url):
+            skip_count += 1
+            continue
+
+        attempted += 1
+        if await send(article):
+            mark_sent(article.url)
+            sent_count += 1
+            # Delay antar pesan agar tidak kena rate-limit Telegram
+            await asyncio.sleep(1.5)
+        elif since:
+            # Kemungkinan rate-limit (RetryAfter); berhenti dan ulangi nanti
+            unfinished.update(a.source for a in queue[i:])
+            logger.warning(
+                "Catch-up: pengiriman gagal, sisa %d artikel dilanjutkan di "
+                "siklus berikutnya.", len(queue) - i,
+            )
+            break
+
+    if watermarks is not None:
+        mark_feeds_success(
+            [url for name, url in RSS_FEEDS.items() if name not in unfinished],
+            cycle_start,
+        )
+        if unfinished:
+            logger.warning(
+                "Feed belum tuntas (%s); watermark-nya tidak dimajukan.",
+                ", ".join(sorted(unfinished)),
+            )
+
+    return sent_count, skip_count